@@ -0,0 +1,217 @@
+import json
+import os
+import re
+from bisect import bisect_right
+from typing import Dict, Optional, Any
+
+CHAPTER_DIR = "chapter"
+HADITH_DIR = "hadiths"
+CATALOG_FILE = "catalog.json"
+
+_LEADING_NUMBER = re.compile(r"\d+")
+
+
+def hadith_numbers(value: Any) -> list:
+    """Returns every integer in a hadith_number field ("2539, 2540" -> [2539, 2540])."""
+    if value is None:
+        return []
+    return [int(n) for n in _LEADING_NUMBER.findall(str(value))]
+
+
+def chapter_filename(book_slug: str, chapter_number: int) -> str:
+    """Returns the path of the translated hadith file for a chapter."""
+    return f"{HADITH_DIR}/{book_slug}/chapter_{chapter_number}.json"
+
+
+def scan_chapter_file(filename: str) -> Optional[Dict[str, Any]]:
+    """Reads a translated chapter file and returns its count, id range and hadith_number range."""
+    if not os.path.exists(filename):
+        return None
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            hadiths = json.load(f)["hadiths"]["data"]
+    except (OSError, KeyError, TypeError, json.JSONDecodeError) as e:
+        print(f"Error reading {filename}: {e}")
+        return None
+
+    ids = []
+    numbers = []
+    for hadith in hadiths:
+        try:
+            ids.append(int(hadith["id"]))
+        except (KeyError, TypeError, ValueError):
+            pass
+        numbers.extend(hadith_numbers(hadith.get("hadith_number")))
+
+    return {
+        "file": filename,
+        "hadith_count": len(hadiths),
+        "id_range": [min(ids), max(ids)] if ids else None,
+        "hadith_number_range": [min(numbers), max(numbers)] if numbers else None,
+        "hadith_numbers": sorted(set(numbers)),
+    }
+
+
+def _apply_chapter_scan(chapter: Dict[str, Any], scan: Optional[Dict[str, Any]]):
+    # Copy the scanned fields onto a catalog chapter entry (or clear them)
+    chapter["file"] = scan["file"] if scan else None
+    chapter["hadith_count"] = scan["hadith_count"] if scan else 0
+    chapter["id_range"] = scan["id_range"] if scan else None
+    chapter["hadith_number_range"] = scan["hadith_number_range"] if scan else None
+
+
+def _reindex_book(book: Dict[str, Any], numbers_by_chapter: Dict[str, list]):
+    # Recompute the per-book offsets and the hadith_number -> chapter lookup
+    offset = 0
+    lookup = {}
+    for key in sorted(book["chapters"], key=int):
+        chapter = book["chapters"][key]
+        chapter["offset"] = offset
+        offset += chapter["hadith_count"]
+        for number in numbers_by_chapter.get(key, []):
+            # First chapter wins when the API lists a number in two chapters
+            lookup.setdefault(str(number), int(key))
+    book["hadith_total"] = offset
+    book["hadith_numbers"] = lookup
+    # [start, end, chapter] sorted by start, for numbers not in the lookup
+    book["hadith_number_ranges"] = sorted(
+        [chapter["hadith_number_range"][0], chapter["hadith_number_range"][1], int(key)]
+        for key, chapter in book["chapters"].items()
+        if chapter["hadith_number_range"]
+    )
+    book["hadith_number_range_starts"] = [r[0] for r in book["hadith_number_ranges"]]
+
+
+def build_book(book_slug: str) -> Optional[Dict[str, Any]]:
+    """Builds the catalog entry for one book from chapter/<book>.json and hadiths/<book>/."""
+    chapter_list = f"{CHAPTER_DIR}/{book_slug}.json"
+    try:
+        with open(chapter_list, "r", encoding="utf-8") as f:
+            chapters = json.load(f)["chapters"]
+    except (OSError, KeyError, json.JSONDecodeError) as e:
+        print(f"Error reading chapter list {chapter_list}: {e}")
+        return None
+
+    book = {"chapters": {}}
+    numbers_by_chapter = {}
+    for chapter in chapters:
+        key = str(int(chapter["chapterNumber"]))
+        entry = {
+            "chapter_id": chapter.get("id"),
+            "english": chapter.get("chapterEnglish", ""),
+            "urdu": chapter.get("chapterUrdu", ""),
+            "arabic": chapter.get("chapterArabic", ""),
+        }
+        scan = scan_chapter_file(chapter_filename(book_slug, int(key)))
+        _apply_chapter_scan(entry, scan)
+        numbers_by_chapter[key] = scan["hadith_numbers"] if scan else []
+        book["chapters"][key] = entry
+
+    book["chapter_count"] = max((int(k) for k in book["chapters"]), default=0)
+    _reindex_book(book, numbers_by_chapter)
+    return book
+
+
+def build_catalog(chapter_dir: str = CHAPTER_DIR) -> Dict[str, Any]:
+    """Builds the catalog for every book that has a chapter list."""
+    catalog = {}
+    for name in sorted(os.listdir(chapter_dir)):
+        if not name.endswith(".json"):
+            continue
+        book_slug = name[: -len(".json")]
+        book = build_book(book_slug)
+        if book is not None:
+            catalog[book_slug] = book
+    return catalog
+
+
+def save_catalog(catalog: Dict[str, Any], filename: str = CATALOG_FILE):
+    """Writes the catalog to disk."""
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_filename, filename)
+
+
+def load_catalog(filename: str = CATALOG_FILE) -> Optional[Dict[str, Any]]:
+    """Loads the precomputed catalog, or returns None if it has not been built."""
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Could not load catalog from {filename}: {e}")
+        return None
+
+
+def update_chapter(catalog: Dict[str, Any], book_slug: str, chapter_number: int) -> bool:
+    """Rescans one chapter file after it was written and refreshes its book's entry.
+
+    Returns False if the book is not in the catalog (run a full rebuild instead).
+    """
+    book = catalog.get(book_slug)
+    if book is None:
+        return False
+
+    key = str(int(chapter_number))
+    chapter = book["chapters"].setdefault(
+        key, {"chapter_id": None, "english": "", "urdu": "", "arabic": ""}
+    )
+    scan = scan_chapter_file(chapter_filename(book_slug, int(key)))
+    _apply_chapter_scan(chapter, scan)
+    book["chapter_count"] = max(book["chapter_count"], int(key))
+
+    # Keep the lookup entries of the untouched chapters, rescan only this one
+    numbers_by_chapter = {}
+    for number, owner in book["hadith_numbers"].items():
+        if str(owner) != key:
+            numbers_by_chapter.setdefault(str(owner), []).append(int(number))
+    numbers_by_chapter[key] = scan["hadith_numbers"] if scan else []
+    _reindex_book(book, numbers_by_chapter)
+    return True
+
+
+def get_chapter_count(catalog: Dict[str, Any], book_slug: str) -> Optional[int]:
+    """Returns the last chapterNumber of a book, or None if the book is not catalogued."""
+    book = catalog.get(book_slug)
+    if book is None:
+        return None
+    return book["chapter_count"]
+
+
+def get_chapter(
+    catalog: Dict[str, Any], book_slug: str, chapter_number: int
+) -> Optional[Dict[str, Any]]:
+    """Returns the catalog entry of a chapter."""
+    book = catalog.get(book_slug)
+    if book is None:
+        return None
+    return book["chapters"].get(str(int(chapter_number)))
+
+
+def resolve_hadith(
+    catalog: Dict[str, Any], book_slug: str, hadith_number: Any
+) -> Optional[int]:
+    """Returns the chapter number containing a hadith_number, or None if unknown."""
+    book = catalog.get(book_slug)
+    numbers = hadith_numbers(hadith_number)
+    if book is None or not numbers:
+        return None
+
+    chapter = book["hadith_numbers"].get(str(numbers[0]))
+    if chapter is not None:
+        return chapter
+
+    # Not in the lookup: fall back to the chapter whose range covers it
+    ranges = book["hadith_number_ranges"]
+    index = bisect_right(book["hadith_number_range_starts"], numbers[0]) - 1
+    if index < 0 or numbers[0] > ranges[index][1]:
+        return None
+    return ranges[index][2]
+
+
+# Main execution
+if __name__ == "__main__":
+    catalog = build_catalog()
+    save_catalog(catalog)
+    chapter_total = sum(len(book["chapters"]) for book in catalog.values())
+    print(f"Catalog saved to {CATALOG_FILE}: {len(catalog)} books, {chapter_total} chapters.")
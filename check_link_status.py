@@ -1,9 +1,9 @@
 import os
-import subprocess
 import requests
-import time
 import sys  # Import the sys module
 
+import connectivity
+
 
 def fetch_and_check_status(url):
     """
@@ -42,16 +42,10 @@ if __name__ == "__main__":
     api_key = os.environ.get("HADITH_API_KEY")  # Replace with your actual API key
     url = f"https://hadithapi.com/api/hadiths?apiKey={api_key}&book=al-silsila-sahiha"
 
-    while True:
-        print(f"Fetching data at {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        success = fetch_and_check_status(url)
-
-        if success:
-            print("Script finished successfully.")
-            subprocess.run(
-                ["python", "C:\\Users\\User\\OneDrive\\Downloads\\hadith\\translate.py"]
-            )
-            sys.exit(0)  # Exit the script gracefully
-        else:
-            print("Trying again in 1 minutes...")
-            time.sleep(60)  # Sleep for 5 minutes (300 seconds)
+    # translate.py now waits for the network itself; this only reports when the API is back.
+    monitor = connectivity.ConnectionMonitor(probe_urls=[url])
+    monitor.wait_until_online()
+    if fetch_and_check_status(url):
+        print("Script finished successfully.")
+        sys.exit(0)
+    sys.exit(1)
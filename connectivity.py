@@ -0,0 +1,154 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, List, Optional, Any
+
+import requests
+
+HADITH_API_PROBE_URL = "https://hadithapi.com/"
+GEMINI_API_PROBE_URL = "https://generativelanguage.googleapis.com/"
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Returns True for errors worth waiting out (no connection, timeouts, 429 and 5xx).
+
+    Anything else (bad JSON, invalid URLs, redirect loops, other 4xx) won't fix
+    itself by retrying and is re-raised to the caller.
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = error.response
+        return response is not None and (
+            response.status_code == 429 or response.status_code >= 500
+        )
+    return isinstance(
+        error,
+        (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ),
+    )
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Returns the Retry-After of a 429/503 response in seconds, if it sent one."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ConnectionMonitor:
+    """Pauses network work while the APIs are unreachable and resumes it in place.
+
+    Replaces the old flow of exiting translate.py and polling from check_link_status.py:
+    callers wrap their requests in call(), and on a connection error the monitor
+    probes the APIs with exponential backoff and jitter until they answer again.
+    """
+
+    def __init__(
+        self,
+        probe_urls: Optional[List[str]] = None,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+        timeout: float = 30.0,
+        max_server_errors: int = 5,
+    ):
+        self.probe_urls = probe_urls or [HADITH_API_PROBE_URL, GEMINI_API_PROBE_URL]
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.max_server_errors = max_server_errors
+        self.online = threading.Event()
+        self.online.set()
+        self._lock = threading.Lock()
+
+    def probe(self) -> bool:
+        """Returns True if every probe URL answers (any status below 500 counts)."""
+        for url in self.probe_urls:
+            try:
+                response = requests.get(url, timeout=self.timeout)
+                if response.status_code >= 500:
+                    print(f"  {url} answered with HTTP {response.status_code}")
+                    return False
+            except requests.exceptions.RequestException as e:
+                print(f"  {url} is unreachable: {e}")
+                return False
+        return True
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Returns the sleep before probe number attempt (full jitter, capped at max_delay)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def wait_until_online(self) -> bool:
+        """Blocks until the APIs are reachable again.
+
+        Only one thread probes; the others wait on the same event. Returns True
+        if there was an outage to wait out, False if the first probe succeeded.
+        """
+        if not self._lock.acquire(blocking=False):
+            self.online.wait()
+            return True
+        try:
+            self.online.clear()
+            attempt = 0
+            while not self.probe():
+                delay = self.backoff_delay(attempt)
+                print(
+                    f"Network unavailable at {time.strftime('%Y-%m-%d %H:%M:%S')}. "
+                    f"Trying again in {delay:.1f} seconds..."
+                )
+                time.sleep(delay)
+                attempt += 1
+            self.online.set()
+            if attempt:
+                print("Connection restored, resuming.")
+            return attempt > 0
+        finally:
+            self._lock.release()
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Runs func, retrying it with backoff on transient network errors.
+
+        After an outage the call is retried as soon as the probes succeed again.
+        429s and 503s wait at least as long as Retry-After asks. Connection
+        errors and 5xx answers from an endpoint whose host still probes fine are
+        retried max_server_errors times before the error is raised.
+        """
+        attempt = 0
+        server_errors = 0
+        while True:
+            self.online.wait()
+            try:
+                return func(*args, **kwargs)
+            except requests.exceptions.RequestException as e:
+                if not is_transient_error(e):
+                    raise
+                response = getattr(e, "response", None)
+                if response is None or response.status_code != 429:
+                    if response is None:
+                        print(f"Network error: {e}. Checking whether the APIs are reachable...")
+                    if self.wait_until_online():
+                        # Connectivity just came back: resume straight away
+                        attempt = 0
+                        continue
+                    server_errors += 1
+                    if server_errors >= self.max_server_errors:
+                        print(f"Giving up after {server_errors} failed attempts: {e}")
+                        raise
+
+                delay = self.backoff_delay(attempt)
+                if response is not None and response.status_code in (429, 503):
+                    delay = max(delay, retry_after_seconds(e) or 0.0)
+                print(f"Retrying in {delay:.1f} seconds ({e})...")
+                time.sleep(delay)
+                attempt += 1
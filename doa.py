@@ -0,0 +1,148 @@
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional, Any
+
+import search
+
+DOA_FILE = "doa.json"
+
+DOA_COLUMNS = ["doa_id", "doa", "ayat", "latin", "artinya", "ayat_search"]
+
+# Stored in the same database as the hadiths (see export.py) and queried through search.py
+DOA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS doa (
+    row_id INTEGER PRIMARY KEY,
+    doa_id TEXT NOT NULL UNIQUE,
+    doa TEXT,
+    ayat TEXT,
+    latin TEXT,
+    artinya TEXT,
+    ayat_search TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS doa_fts USING fts5 (
+    doa, latin, artinya, ayat_search,
+    content='doa', content_rowid='row_id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS doa_fts_insert AFTER INSERT ON doa BEGIN
+    INSERT INTO doa_fts (rowid, doa, latin, artinya, ayat_search)
+    VALUES (new.row_id, new.doa, new.latin, new.artinya, new.ayat_search);
+END;
+CREATE TRIGGER IF NOT EXISTS doa_fts_delete AFTER DELETE ON doa BEGIN
+    INSERT INTO doa_fts (doa_fts, rowid, doa, latin, artinya, ayat_search)
+    VALUES ('delete', old.row_id, old.doa, old.latin, old.artinya, old.ayat_search);
+END;
+"""
+
+
+def load_doa(filename: str = DOA_FILE) -> Optional[List[Dict[str, Any]]]:
+    """Loads the doa list saved by fetch.py, or returns None if it is missing or unreadable."""
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            doa_list = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Could not load doa from {filename}: {e}")
+        return None
+    if not isinstance(doa_list, list):
+        print(f"Could not load doa from {filename}: expected a list")
+        return None
+    return doa_list
+
+
+def save_doa(doa_list: List[Dict[str, Any]], filename: str = DOA_FILE):
+    """Writes the doa list in the same format fetch.py has always used."""
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as f:
+        json.dump(doa_list, f)
+    os.replace(tmp_filename, filename)
+
+
+def doa_by_id(doa_list: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Maps id -> doa, skipping malformed entries that have no id."""
+    by_id = {}
+    for doa in doa_list:
+        if isinstance(doa, dict) and doa.get("id") is not None:
+            by_id[str(doa["id"])] = doa
+        else:
+            print(f"Skipping doa entry without an id: {doa}")
+    return by_id
+
+
+def diff_doa(
+    old_list: List[Dict[str, Any]], new_list: List[Dict[str, Any]]
+) -> Dict[str, List[str]]:
+    """Compares two doa lists by id and returns the added, changed and removed ids."""
+    old_by_id = doa_by_id(old_list)
+    new_by_id = doa_by_id(new_list)
+    return {
+        "added": [key for key in new_by_id if key not in old_by_id],
+        "changed": [
+            key
+            for key in new_by_id
+            if key in old_by_id and old_by_id[key] != new_by_id[key]
+        ],
+        "removed": [key for key in old_by_id if key not in new_by_id],
+    }
+
+
+def refresh_doa(
+    new_list: List[Dict[str, Any]], filename: str = DOA_FILE
+) -> Dict[str, List[str]]:
+    """Merges a freshly fetched doa list into doa.json.
+
+    Unchanged entries are kept as they are, changed ones are replaced in place,
+    new ones are appended and the file is only rewritten if something changed.
+    """
+    # A missing or unreadable doa.json is replaced by the fetched list
+    old_list = (load_doa(filename) if os.path.exists(filename) else None) or []
+    changes = diff_doa(old_list, new_list)
+    if not any(changes.values()):
+        return changes
+
+    new_by_id = doa_by_id(new_list)
+    merged = [new_by_id[key] for key in doa_by_id(old_list) if key in new_by_id]
+    merged.extend(new_by_id[key] for key in changes["added"])
+    save_doa(merged, filename)
+    return changes
+
+
+def _doa_row(doa_id: str, doa: Dict[str, Any]) -> tuple:
+    return (
+        doa_id,
+        doa.get("doa", ""),
+        doa.get("ayat", ""),
+        doa.get("latin", ""),
+        doa.get("artinya", ""),
+        search.normalize_arabic(doa.get("ayat", "")),
+    )
+
+
+def export_doa(
+    connection: sqlite3.Connection, doa_list: List[Dict[str, Any]]
+) -> Dict[str, int]:
+    """Brings the doa table in line with doa_list, only rewriting rows that changed."""
+    connection.executescript(DOA_SCHEMA)
+    columns = ", ".join(DOA_COLUMNS)
+    exported = {
+        row[0]: tuple(row)
+        for row in connection.execute(f"SELECT {columns} FROM doa")
+    }
+    wanted = {key: _doa_row(key, doa) for key, doa in doa_by_id(doa_list).items()}
+
+    stats = {"written": 0, "removed": 0}
+    with connection:
+        for key in exported:
+            if key not in wanted:
+                connection.execute("DELETE FROM doa WHERE doa_id = ?", (key,))
+                stats["removed"] += 1
+        for key, row in wanted.items():
+            if exported.get(key) == row:
+                continue
+            # Delete then insert so the FTS delete trigger sees the old row
+            connection.execute("DELETE FROM doa WHERE doa_id = ?", (key,))
+            connection.execute(
+                f"INSERT INTO doa ({columns}) VALUES ({', '.join('?' * len(DOA_COLUMNS))})",
+                row,
+            )
+            stats["written"] += 1
+    return stats
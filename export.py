@@ -0,0 +1,374 @@
+import argparse
+import array
+import glob
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+
+import catalog
+import doa
+
+# Also holds the doa table (doa.export_doa); query both through search.py
+EXPORT_DIR = "export"
+DATABASE_FILE = "hadiths.sqlite"
+
+HADITH_COLUMNS = [
+    "hadith_id",
+    "hadith_number",
+    "status",
+    "nama_buku",
+    "penulis_buku",
+    "tajuk_hadith",
+    "perawi_melayu",
+    "english_text",
+    "malay_translation",
+    "arabic_text",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chapters (
+    book TEXT NOT NULL,
+    chapter INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (book, chapter)
+);
+CREATE TABLE IF NOT EXISTS hadiths (
+    row_id INTEGER PRIMARY KEY,
+    book TEXT NOT NULL,
+    chapter INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    hadith_id INTEGER,
+    hadith_number TEXT,
+    status TEXT,
+    nama_buku TEXT,
+    penulis_buku TEXT,
+    tajuk_hadith TEXT,
+    perawi_melayu TEXT,
+    english_text TEXT,
+    malay_translation TEXT,
+    arabic_text TEXT
+);
+CREATE INDEX IF NOT EXISTS hadiths_book_chapter ON hadiths (book, chapter, position);
+CREATE INDEX IF NOT EXISTS hadiths_hadith_id ON hadiths (hadith_id);
+CREATE INDEX IF NOT EXISTS hadiths_book_number ON hadiths (book, hadith_number);
+CREATE VIRTUAL TABLE IF NOT EXISTS hadiths_fts USING fts5 (
+    malay_translation, english_text, tajuk_hadith,
+    content='hadiths', content_rowid='row_id'
+);
+CREATE TRIGGER IF NOT EXISTS hadiths_fts_insert AFTER INSERT ON hadiths BEGIN
+    INSERT INTO hadiths_fts (rowid, malay_translation, english_text, tajuk_hadith)
+    VALUES (new.row_id, new.malay_translation, new.english_text, new.tajuk_hadith);
+END;
+CREATE TRIGGER IF NOT EXISTS hadiths_fts_delete AFTER DELETE ON hadiths BEGIN
+    INSERT INTO hadiths_fts (hadiths_fts, rowid, malay_translation, english_text, tajuk_hadith)
+    VALUES ('delete', old.row_id, old.malay_translation, old.english_text, old.tajuk_hadith);
+END;
+"""
+
+# Column arrays written next to the database; (file, .npy dtype, array typecode)
+ID_ARRAY = ("ids.npy", "<i8", "q")
+BOOK_CODE_ARRAY = ("book_codes.npy", "|u1", "B")
+CHAPTER_ARRAY = ("chapters.npy", "<i4", "i")
+TEXT_OFFSET_ARRAY = ("text_offsets.npy", "<i8", "q")
+TEXT_FILE = "malay_translation.bin"
+BOOK_CODES_FILE = "book_codes.json"
+
+
+def iter_chapter_files(book_slug: str) -> Iterator[Tuple[int, str, os.stat_result]]:
+    """Yields (chapter number, path, stat) for every translated chapter file of a book."""
+    for filename in glob.glob(f"{catalog.HADITH_DIR}/{book_slug}/chapter_*.json"):
+        match = re.search(r"chapter_(\d+)\.json$", filename)
+        if match:
+            yield int(match.group(1)), filename, os.stat(filename)
+
+
+def load_chapter(filename: str) -> Optional[List[Dict[str, Any]]]:
+    """Returns the hadiths of a chapter file, or None if it cannot be read."""
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            hadiths = json.load(f)["hadiths"]["data"]
+    except (OSError, KeyError, TypeError, json.JSONDecodeError) as e:
+        print(f"Error reading {filename}: {e}")
+        return None
+    if not isinstance(hadiths, list):
+        print(f"Error reading {filename}: hadiths.data is not a list")
+        return None
+    return hadiths
+
+
+def iter_hadith_rows(
+    book_slug: str, chapter: int, hadiths: List[Dict[str, Any]]
+) -> Iterator[tuple]:
+    """Yields one hadiths table row per hadith of a chapter."""
+    for position, hadith in enumerate(hadiths):
+        try:
+            hadith_id = int(hadith.get("id"))
+        except (TypeError, ValueError):
+            hadith_id = None
+        # A few translations came back with a misspelt title key
+        title = hadith.get("tajuk_hadith") or hadith.get("tajuk_Hadith") or ""
+        yield (
+            book_slug,
+            chapter,
+            position,
+            hadith_id,
+            hadith.get("hadith_number"),
+            hadith.get("status", ""),
+            hadith.get("nama_buku", ""),
+            hadith.get("penulis_buku", ""),
+            title,
+            hadith.get("perawi_melayu", ""),
+            hadith.get("english_text", ""),
+            hadith.get("malay_translation", ""),
+            hadith.get("arabic_text", ""),
+        )
+
+
+def read_book(
+    book_slug: str, exported: Dict[int, Tuple[int, int]]
+) -> Tuple[str, List[Tuple[int, int, int, List[tuple]]], List[int], List[int]]:
+    """Parses the chapters of a book that changed since the last export.
+
+    Runs in a worker process. Returns the book, (chapter, mtime_ns, size, rows)
+    for every new or modified chapter, the exported chapters whose file is gone,
+    and the chapters whose file could not be read (left as they are, retried next run).
+    """
+    changed = []
+    failed = []
+    seen = set()
+    for chapter, filename, stat in iter_chapter_files(book_slug):
+        seen.add(chapter)
+        if exported.get(chapter) == (stat.st_mtime_ns, stat.st_size):
+            continue
+        hadiths = load_chapter(filename)
+        if hadiths is None:
+            failed.append(chapter)
+            continue
+        rows = list(iter_hadith_rows(book_slug, chapter, hadiths))
+        changed.append((chapter, stat.st_mtime_ns, stat.st_size, rows))
+    removed = [chapter for chapter in exported if chapter not in seen]
+    return book_slug, changed, removed, failed
+
+
+def list_books() -> List[str]:
+    """Returns the book slugs that have translated hadith files."""
+    if not os.path.isdir(catalog.HADITH_DIR):
+        return []
+    return sorted(
+        name
+        for name in os.listdir(catalog.HADITH_DIR)
+        if os.path.isdir(os.path.join(catalog.HADITH_DIR, name))
+    )
+
+
+def export_database(
+    database: str, books: List[str], workers: Optional[int] = None
+) -> Dict[str, int]:
+    """Exports new and modified chapters into SQLite, parsing books in parallel."""
+    connection = sqlite3.connect(database)
+    connection.executescript(SCHEMA)
+
+    exported = {book: {} for book in books}
+    for book, chapter, mtime_ns, size in connection.execute(
+        "SELECT book, chapter, mtime_ns, size FROM chapters"
+    ):
+        exported.setdefault(book, {})[chapter] = (mtime_ns, size)
+
+    placeholders = ", ".join("?" * (3 + len(HADITH_COLUMNS)))
+    insert_sql = (
+        f"INSERT INTO hadiths (book, chapter, position, {', '.join(HADITH_COLUMNS)}) "
+        f"VALUES ({placeholders})"
+    )
+    stats = {"chapters": 0, "hadiths": 0, "removed": 0, "failed": 0}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            read_book, list(exported), [exported[book] for book in exported]
+        )
+        for book, changed, removed, failed in results:
+            with connection:
+                for chapter in removed:
+                    connection.execute(
+                        "DELETE FROM hadiths WHERE book = ? AND chapter = ?", (book, chapter)
+                    )
+                    connection.execute(
+                        "DELETE FROM chapters WHERE book = ? AND chapter = ?", (book, chapter)
+                    )
+                    stats["removed"] += 1
+                for chapter, mtime_ns, size, rows in changed:
+                    connection.execute(
+                        "DELETE FROM hadiths WHERE book = ? AND chapter = ?", (book, chapter)
+                    )
+                    connection.executemany(insert_sql, rows)
+                    connection.execute(
+                        "INSERT OR REPLACE INTO chapters VALUES (?, ?, ?, ?)",
+                        (book, chapter, mtime_ns, size),
+                    )
+                    stats["chapters"] += 1
+                    stats["hadiths"] += len(rows)
+            stats["failed"] += len(failed)
+            if changed or removed or failed:
+                print(
+                    f"  {book}: {len(changed)} chapters exported, {len(removed)} removed, "
+                    f"{len(failed)} unreadable"
+                )
+
+    connection.close()
+    return stats
+
+
+def write_npy(filename: str, values: array.array, dtype: str):
+    """Writes a 1-D array in .npy format so numpy.load(..., mmap_mode="r") can map it."""
+    header = f"{{'descr': '{dtype}', 'fortran_order': False, 'shape': ({len(values)},), }}"
+    # Magic (6) + version (2) + header length (2) + header, padded to 64 bytes
+    padding = 64 - (10 + len(header) + 1) % 64
+    header = header + " " * padding + "\n"
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    with open(filename, "wb") as f:
+        f.write(b"\x93NUMPY\x01\x00")
+        f.write(len(header).to_bytes(2, "little"))
+        f.write(header.encode("latin1"))
+        values.tofile(f)
+
+
+def export_columns(database: str, export_dir: str) -> int:
+    """Writes the id, book code, chapter and text offset arrays from the database.
+
+    malay_translation texts are concatenated as UTF-8 into one file; row i spans
+    text_offsets[i]:text_offsets[i + 1].
+    """
+    connection = sqlite3.connect(database)
+    books = [
+        book for (book,) in connection.execute("SELECT DISTINCT book FROM hadiths ORDER BY book")
+    ]
+    book_codes = {book: code for code, book in enumerate(books)}
+
+    ids = array.array(ID_ARRAY[2])
+    codes = array.array(BOOK_CODE_ARRAY[2])
+    chapters = array.array(CHAPTER_ARRAY[2])
+    offsets = array.array(TEXT_OFFSET_ARRAY[2], [0])
+
+    with open(os.path.join(export_dir, TEXT_FILE), "wb") as text_file:
+        rows = connection.execute(
+            "SELECT hadith_id, book, chapter, malay_translation FROM hadiths "
+            "ORDER BY book, chapter, position"
+        )
+        for hadith_id, book, chapter, text in rows:
+            encoded = (text or "").encode("utf-8")
+            text_file.write(encoded)
+            ids.append(hadith_id if hadith_id is not None else -1)
+            codes.append(book_codes[book])
+            chapters.append(chapter)
+            offsets.append(offsets[-1] + len(encoded))
+    connection.close()
+
+    for (name, dtype, _), values in (
+        (ID_ARRAY, ids),
+        (BOOK_CODE_ARRAY, codes),
+        (CHAPTER_ARRAY, chapters),
+        (TEXT_OFFSET_ARRAY, offsets),
+    ):
+        write_npy(os.path.join(export_dir, name), values, dtype)
+    with open(os.path.join(export_dir, BOOK_CODES_FILE), "w", encoding="utf-8") as f:
+        json.dump(books, f, indent=2)
+    return len(ids)
+
+
+def _time(func) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def benchmark(export_dir: str, query: str = "solat"):
+    """Compares loading the corpus from JSON files, SQLite and the column arrays."""
+
+    def load_json():
+        count = 0
+        for filename in glob.glob(f"{catalog.HADITH_DIR}/*/chapter_*.json"):
+            with open(filename, "r", encoding="utf-8") as f:
+                count += len(json.load(f)["hadiths"]["data"])
+        return count
+
+    def load_sqlite():
+        connection = sqlite3.connect(os.path.join(export_dir, DATABASE_FILE))
+        count = connection.execute("SELECT COUNT(*) FROM hadiths").fetchone()[0]
+        connection.close()
+        return count
+
+    def search_sqlite():
+        connection = sqlite3.connect(os.path.join(export_dir, DATABASE_FILE))
+        count = connection.execute(
+            "SELECT COUNT(*) FROM hadiths_fts WHERE hadiths_fts MATCH ?", (query,)
+        ).fetchone()[0]
+        connection.close()
+        return count
+
+    def load_columns():
+        try:
+            import numpy
+        except ImportError:
+            # Without numpy, read the raw data after the .npy header
+            with open(os.path.join(export_dir, ID_ARRAY[0]), "rb") as f:
+                f.seek(10 + int.from_bytes(f.read(10)[8:10], "little"))
+                ids = array.array(ID_ARRAY[2], f.read())
+            return len(ids)
+        ids = numpy.load(os.path.join(export_dir, ID_ARRAY[0]), mmap_mode="r")
+        numpy.load(os.path.join(export_dir, BOOK_CODE_ARRAY[0]), mmap_mode="r")
+        numpy.load(os.path.join(export_dir, CHAPTER_ARRAY[0]), mmap_mode="r")
+        numpy.load(os.path.join(export_dir, TEXT_OFFSET_ARRAY[0]), mmap_mode="r")
+        return len(ids)
+
+    print("Load-time benchmark:")
+    for label, func in (
+        ("JSON files (json.load)", load_json),
+        ("SQLite (open + count)", load_sqlite),
+        (f"SQLite FTS5 (MATCH '{query}')", search_sqlite),
+        ("Column arrays (mmap)", load_columns),
+    ):
+        elapsed, count = _time(func)
+        print(f"  {label:<32} {elapsed:10.1f} ms  ({count} rows)")
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export hadiths/<book>/chapter_N.json to SQLite and column arrays."
+    )
+    parser.add_argument("--output", default=EXPORT_DIR, help="Export directory")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel book readers")
+    parser.add_argument("--benchmark", action="store_true", help="Time loading after export")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    database = os.path.join(args.output, DATABASE_FILE)
+
+    elapsed, stats = _time(lambda: export_database(database, list_books(), args.workers))
+    print(
+        f"Exported {stats['hadiths']} hadiths from {stats['chapters']} chapters "
+        f"({stats['removed']} removed, {stats['failed']} unreadable) "
+        f"to {database} in {elapsed:.0f} ms."
+    )
+    doa_list = doa.load_doa()
+    if doa_list is None:
+        # Keep the exported doa rows rather than treating every entry as removed
+        print("Skipping doa export; the doa table is left as it is.")
+    else:
+        connection = sqlite3.connect(database)
+        doa_stats = doa.export_doa(connection, doa_list)
+        connection.close()
+        print(f"Doa table: {doa_stats['written']} written, {doa_stats['removed']} removed.")
+
+    row_count = export_columns(database, args.output)
+    print(f"Column arrays for {row_count} hadiths saved to {args.output}/")
+
+    if args.benchmark:
+        benchmark(args.output)
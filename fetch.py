@@ -1,6 +1,8 @@
 import json
 import requests
 
+import doa
+
 
 def fetch_hadith_data(url):
     """Fetches the JSON data from the given URL."""
@@ -70,11 +72,16 @@ if __name__ == "__main__":
     url = "https://doa-doa-api-ahmadramadhan.fly.dev/api"
     hadith_data = fetch_hadith_data(url)
 
-    if hadith_data:
+    if isinstance(hadith_data, list):
         # display_hadith_table(hadith_data)
-        # save into file
-        with open("doa.json", "w") as file:
-            json.dump(hadith_data, file)
-        print("Data saved to doa.json")
+        # merge into doa.json, only rewriting it if an entry changed
+        changes = doa.refresh_doa(hadith_data)
+        if any(changes.values()):
+            print(
+                f"Data saved to doa.json ({len(changes['added'])} added, "
+                f"{len(changes['changed'])} changed, {len(changes['removed'])} removed)"
+            )
+        else:
+            print("doa.json is already up to date.")
     else:
         print("No data to save.")
@@ -0,0 +1,119 @@
+import re
+import sqlite3
+import unicodedata
+from typing import List, Optional, Any
+
+# Harakat, Quranic annotation marks, superscript alef and tatweel
+_ARABIC_MARKS = re.compile(r"[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+_ARABIC_LETTERS = str.maketrans(
+    {
+        "\u0622": "\u0627",  # alef with madda -> alef
+        "\u0623": "\u0627",  # alef with hamza above -> alef
+        "\u0625": "\u0627",  # alef with hamza below -> alef
+        "\u0671": "\u0627",  # alef wasla -> alef
+        "\u0649": "\u064a",  # alef maksura -> ya
+        "\u06cc": "\u064a",  # farsi ya -> ya
+        "\u0629": "\u0647",  # ta marbuta -> ha
+        "\u0624": "\u0648",  # waw with hamza -> waw
+        "\u0626": "\u064a",  # ya with hamza -> ya
+    }
+)
+_WORD = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercases latin text and strips accents and punctuation ("Wa'alallohi" -> "wa alallohi")."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(_WORD.findall(text.casefold().replace("_", " ")))
+
+
+def normalize_arabic(text: str) -> str:
+    """Strips harakat and tatweel and folds alef/ya/ta marbuta variants."""
+    text = unicodedata.normalize("NFC", text or "")
+    text = _ARABIC_MARKS.sub("", text).translate(_ARABIC_LETTERS)
+    return " ".join(_WORD.findall(text))
+
+
+def fts_query(normalized: str) -> str:
+    """Turns normalized text into an FTS5 query matching every word (the last one as a prefix)."""
+    tokens = normalized.split()
+    if not tokens:
+        return ""
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def connect(database: str) -> sqlite3.Connection:
+    """Opens the database written by export.py; rows come back as sqlite3.Row."""
+    connection = sqlite3.connect(database)
+    connection.row_factory = sqlite3.Row
+    return connection
+
+
+def _match(
+    connection: sqlite3.Connection, sql: str, query: str, limit: int
+) -> List[sqlite3.Row]:
+    # Empty queries would be an FTS5 syntax error, so they match nothing
+    if not query:
+        return []
+    return connection.execute(sql, (query, limit)).fetchall()
+
+
+def search_hadiths(
+    connection: sqlite3.Connection, query: str, limit: int = 20
+) -> List[sqlite3.Row]:
+    """Searches malay_translation, english_text and tajuk_hadith, best matches first."""
+    return _match(
+        connection,
+        "SELECT hadiths.* FROM hadiths_fts JOIN hadiths ON hadiths.row_id = hadiths_fts.rowid "
+        "WHERE hadiths_fts MATCH ? ORDER BY rank LIMIT ?",
+        fts_query(normalize_text(query)),
+        limit,
+    )
+
+
+def get_hadith(
+    connection: sqlite3.Connection, book_slug: str, hadith_number: str
+) -> Optional[sqlite3.Row]:
+    """Returns a hadith by book and hadith_number."""
+    return connection.execute(
+        "SELECT * FROM hadiths WHERE book = ? AND hadith_number = ?",
+        (book_slug, str(hadith_number)),
+    ).fetchone()
+
+
+def search_doa(
+    connection: sqlite3.Connection, query: str, limit: int = 20
+) -> List[sqlite3.Row]:
+    """Searches doa, latin and artinya, ignoring case, accents and punctuation."""
+    query = fts_query(normalize_text(query))
+    return _match(
+        connection,
+        "SELECT doa.* FROM doa_fts JOIN doa ON doa.row_id = doa_fts.rowid "
+        "WHERE doa_fts MATCH ? ORDER BY rank LIMIT ?",
+        f"{{doa latin artinya}} : ({query})" if query else "",
+        limit,
+    )
+
+
+def search_doa_arabic(
+    connection: sqlite3.Connection, query: str, limit: int = 20
+) -> List[sqlite3.Row]:
+    """Searches ayat, ignoring harakat and alef/ya/ta marbuta variants."""
+    query = fts_query(normalize_arabic(query))
+    return _match(
+        connection,
+        "SELECT doa.* FROM doa_fts JOIN doa ON doa.row_id = doa_fts.rowid "
+        "WHERE doa_fts MATCH ? ORDER BY rank LIMIT ?",
+        f"ayat_search : ({query})" if query else "",
+        limit,
+    )
+
+
+def get_doa(connection: sqlite3.Connection, doa_id: Any) -> Optional[sqlite3.Row]:
+    """Returns a doa by its id ("6" or 6)."""
+    return connection.execute(
+        "SELECT * FROM doa WHERE doa_id = ?", (str(doa_id),)
+    ).fetchone()
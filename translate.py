@@ -6,9 +6,11 @@ from typing import List, Dict, Optional, Any
 import sys  # For writing loading animation to console
 import threading
 import os  # For creating directories
-import subprocess
 import signal
 
+import catalog
+import connectivity
+
 
 def signal_handler(sig, frame):
     print("You pressed Ctrl+C!")
@@ -71,7 +73,7 @@ def fetch_hadith_data(
 ) -> Optional[Dict[str, Any]]:  # Adjusted to return total count
     # """Fetches Hadith data from the specified API endpoint."""
     try:
-        response = requests.get(api_url)
+        response = requests.get(api_url, timeout=NETWORK.timeout)
         response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
         data = response.json()
 
@@ -103,7 +105,7 @@ def process_hadiths(
     # Fetches Hadith data, translates each Hadith, and returns a list of translated Hadiths.
     # """
     if all_hadiths_data is None:
-        hadith_data = fetch_hadith_data(api_url)
+        hadith_data = NETWORK.call(fetch_hadith_data, api_url)
         if (
             not hadith_data
             or "hadiths" not in hadith_data
@@ -202,6 +204,18 @@ def process_hadiths(
                             time.sleep(5)  # Wait before retrying with the same model
                         continue  # Continue to the next retry attempt with potentially a new model.
                     else:
+                        # Stop the animation so it doesn't overwrite the network messages
+                        stop_loading = True
+                        loading_thread.join()
+                        if not NETWORK.probe():
+                            # Lost connection: wait it out without using up an attempt
+                            print()
+                            NETWORK.wait_until_online()
+                            stop_loading = False
+                            loading_thread = threading.Thread(target=animate_loading)
+                            loading_thread.daemon = True
+                            loading_thread.start()
+                            continue
                         print(f"  Other Error during translation: {e}")
                         break  # Break retry loop for unhandled errors
                 attempts += 1
@@ -250,10 +264,15 @@ def process_hadiths(
 
 
 def get_chapter_count(book_slug: str, api_key: str) -> Optional[int]:
-    # """Fetches the number of chapters for a given book."""
+    # """Looks up the number of chapters for a given book, asking the API only if it is not in the catalog."""
+    if CHAPTER_CATALOG is not None:
+        total_chapters = catalog.get_chapter_count(CHAPTER_CATALOG, book_slug)
+        if total_chapters is not None:
+            return total_chapters
+
     url = f"https://hadithapi.com/api/{book_slug}/chapters?apiKey={api_key}"
     try:
-        response = requests.get(url)
+        response = requests.get(url, timeout=NETWORK.timeout)
         response.raise_for_status()
         data = response.json()
 
@@ -284,6 +303,14 @@ def get_chapter_count(book_slug: str, api_key: str) -> Optional[int]:
         return None
 
 
+def refresh_catalog(book_slug: str, chapter_number: int):
+    # """Rescans a chapter file that was just written so the catalog stays in sync."""
+    if CHAPTER_CATALOG is not None and catalog.update_chapter(
+        CHAPTER_CATALOG, book_slug, chapter_number
+    ):
+        catalog.save_catalog(CHAPTER_CATALOG)
+
+
 def process_book(
     book_slug: str,
     book_name: str,
@@ -295,7 +322,7 @@ def process_book(
     model_index: int = 0,
 ):
     # """Processes all chapters of a book, fetches hadiths, translates them, and saves to JSON files."""
-    chapter_count = get_chapter_count(book_slug, api_key)
+    chapter_count = NETWORK.call(get_chapter_count, book_slug, api_key)
 
     if chapter_count is None:
         print(f"Failed to get chapter count for {book_name}.")
@@ -323,7 +350,7 @@ def process_book(
         hadith_api_url = f"https://hadithapi.com/public/api/hadiths?apiKey={api_key}&book={book_slug}&chapter={chapter_number}&paginate=1000"
 
         # Fetch all hadiths for the chapter from the API to get the total count
-        all_hadiths_data_response = fetch_hadith_data(hadith_api_url)
+        all_hadiths_data_response = NETWORK.call(fetch_hadith_data, hadith_api_url)
 
         if not all_hadiths_data_response or "hadiths" not in all_hadiths_data_response:
             print(
@@ -391,6 +418,9 @@ def process_book(
 
                 existing_ids = {hadith["id"] for hadith in existing_hadiths}
 
+            # The file was rewritten above (defective hadiths dropped)
+            refresh_catalog(book_slug, chapter_number)
+
             if isBroken:
                 # Rerun the method
                 process_book(
@@ -449,6 +479,7 @@ def process_book(
                     with open(filename, "w", encoding="utf-8") as f:
                         json.dump(existing_data, f, indent=2, ensure_ascii=False)
                     print(f"Appended translated hadiths to {filename}")
+                    refresh_catalog(book_slug, chapter_number)
                 else:
                     print(
                         "No missing hadiths were translated for {book_name} - Chapter {chapter_number}."
@@ -494,6 +525,7 @@ def process_book(
             with open(filename, "w", encoding="utf-8") as f:
                 json.dump(output_data, f, indent=2, ensure_ascii=False)
             print(f"Saved translated hadiths to {filename}")
+            refresh_catalog(book_slug, chapter_number)
         else:
             print(f"No hadiths translated for {book_name} - Chapter {chapter_number}.")
 
@@ -503,6 +535,8 @@ GEMINI_API_KEY = (
     os.environ.get("GEMINI_API_KEY")  # Replace with your actual API key
 )
 HADITH_API_KEY = os.environ.get("HADITH_API_KEY")  # Replace with your actual API key
+CHAPTER_CATALOG = catalog.load_catalog()  # Built by catalog.py
+NETWORK = connectivity.ConnectionMonitor()  # Pauses and resumes API calls on network errors
 TRANSLATION_PROMPT = """
 You are a highly skilled translator specializing in Islamic texts. Your task is to translate Hadith data from English to Malay (Malaysia), ensuring accuracy, cultural sensitivity, and preservation of the original message's religious and spiritual meaning.
 
@@ -586,22 +620,13 @@ try:
             else:
                 print("No Error Hadiths found.")
 
+        # Connection drops and 429/5xx are retried in place by NETWORK, so
+        # only permanent errors (e.g. a rejected API key) end up here.
         except requests.exceptions.HTTPError as e:
             print(f"HTTP Error: {e}")
-            print("Running check_link_status.py to check network connection...")
-            subprocess.run(
-                [
-                    "python",
-                    "C:\\Users\\User\\OneDrive\\Downloads\\hadith\\check_link_status.py",
-                ]
-            )
             sys.exit(1)
         except requests.exceptions.RequestException as e:
             print(f"A network error occurred: {e}")
-            print("Running check_link_status.py to check network connection...")
-            subprocess.run(
-                ["python", "C:\\Users\\User\\OneDrive\\Downloads\\hadith\\check_link_status.py"]
-            )
             sys.exit(1)
 
 except KeyboardInterrupt: